@@ -84,6 +84,12 @@ _LAUNCHED_WORKER_PATTERN = re.compile(r'(\d+) ray[._]worker[._]default')
 _LAUNCHING_IP_PATTERN = re.compile(
     r'({}): ray[._]worker[._]default'.format(IP_ADDR_REGEX))
 WAIT_HEAD_NODE_IP_MAX_ATTEMPTS = 3
+# Head IPs queried while provisioning are reused within this many seconds, as
+# a multi-node launch queries the same head IP again once the workers are up
+# (each query runs `ray get-head-ip`, which hits the cloud API).
+_HEAD_IP_CACHE_TTL_SECONDS = 30
+# Maps the absolute cluster yaml path to (query time, head IP).
+_head_ip_cache: Dict[str, Tuple[float, str]] = {}
 
 # We use fixed IP address to avoid DNS lookup blocking the check, for machine
 # with no internet connection.
@@ -980,7 +986,9 @@ def wait_until_ray_cluster_ready(
     # launched especially for Azure.
     try:
         head_ip = _query_head_ip_with_retries(
-            cluster_config_file, max_attempts=WAIT_HEAD_NODE_IP_MAX_ATTEMPTS)
+            cluster_config_file,
+            max_attempts=WAIT_HEAD_NODE_IP_MAX_ATTEMPTS,
+            use_cache=True)
     except RuntimeError as e:
         logger.error(e)
         return False  # failed
@@ -1211,17 +1219,33 @@ def get_cleaned_username() -> str:
     return username
 
 
+def invalidate_head_ip_cache(cluster_yaml: str) -> None:
+    """Drops the cached head IP of a cluster, e.g. when it is stopped."""
+    _head_ip_cache.pop(str(pathlib.Path(cluster_yaml).expanduser()), None)
+
+
 def _query_head_ip_with_retries(cluster_yaml: str,
-                                max_attempts: int = 1) -> str:
+                                max_attempts: int = 1,
+                                use_cache: bool = False) -> str:
     """Returns the IP of the head node by querying the cloud.
 
+    If use_cache is True, the result of a query made within the last
+    _HEAD_IP_CACHE_TTL_SECONDS is reused, and a new result is cached.
+    Otherwise, the cache is neither read nor updated.
+
     Raises:
       RuntimeError: if we failed to get the head IP.
     """
+    full_cluster_yaml = str(pathlib.Path(cluster_yaml).expanduser())
+    cached = _head_ip_cache.get(full_cluster_yaml)
+    query_time = time.monotonic()
+    if (use_cache and cached is not None and
+            query_time - cached[0] < _HEAD_IP_CACHE_TTL_SECONDS):
+        return cached[1]
+
     backoff = common_utils.Backoff(initial_backoff=5, max_backoff_factor=5)
     for i in range(max_attempts):
         try:
-            full_cluster_yaml = str(pathlib.Path(cluster_yaml).expanduser())
             out = subprocess_utils.run(
                 f'ray get-head-ip {full_cluster_yaml!r}',
                 stdout=subprocess.PIPE,
@@ -1249,6 +1273,8 @@ def _query_head_ip_with_retries(cluster_yaml: str,
             # Retry if the cluster is not up yet.
             logger.debug('Retrying to get head ip.')
             time.sleep(backoff.current_backoff())
+    if use_cache:
+        _head_ip_cache[full_cluster_yaml] = (query_time, head_ip)
     return head_ip
 
 
@@ -1258,8 +1284,13 @@ def get_node_ips(cluster_yaml: str,
                  handle: Optional[backends.Backend.ResourceHandle] = None,
                  head_ip_max_attempts: int = 1,
                  worker_ip_max_attempts: int = 1,
-                 get_internal_ips: bool = False) -> List[str]:
-    """Returns the IPs of all nodes in the cluster, with head node at front."""
+                 get_internal_ips: bool = False,
+                 use_cached_head_ip: bool = False) -> List[str]:
+    """Returns the IPs of all nodes in the cluster, with head node at front.
+
+    If use_cached_head_ip is True, a head IP queried within the last
+    _HEAD_IP_CACHE_TTL_SECONDS while provisioning is reused.
+    """
     # When ray up launches TPU VM Pod, Pod workers (except for the head)
     # won't be connected to Ray cluster. Thus "ray get-worker-ips"
     # won't work and we need to query the node IPs with gcloud as
@@ -1289,8 +1320,12 @@ def get_node_ips(cluster_yaml: str,
     # happens.
     check_network_connection()
     try:
-        head_ip = _query_head_ip_with_retries(cluster_yaml,
-                                              max_attempts=head_ip_max_attempts)
+        # The temporary yaml written for internal IPs gets a new path on
+        # every call, so caching its result would only leak entries.
+        head_ip = _query_head_ip_with_retries(
+            cluster_yaml,
+            max_attempts=head_ip_max_attempts,
+            use_cache=use_cached_head_ip and not get_internal_ips)
     except RuntimeError as e:
         raise exceptions.FetchIPError(
             exceptions.FetchIPError.Reason.HEAD) from e
@@ -1387,6 +1387,8 @@ class RetryingVmProvisioner(object):
         # waits for all workers; turn it into real gang scheduling.
         # FIXME: refactor code path to remove use of stream_logs
         del stream_logs
+        # The head node may be (re)created below with a different IP.
+        backend_utils.invalidate_head_ip_cache(cluster_config_file)
 
         def ray_up():
             # Runs `ray up <kwargs>` with our monkey-patched launch hash
@@ -1877,15 +1879,18 @@ class CloudVmRayBackend(backends.Backend):
             self.launched_resources = self.launched_resources.copy(
                 region=region)
 
-        def _update_stable_cluster_ips(self,
-                                       max_attempts: int = 1) -> List[str]:
+        def _update_stable_cluster_ips(
+                self,
+                max_attempts: int = 1,
+                use_cached_head_ip: bool = False) -> List[str]:
             cluster_external_ips = backend_utils.get_node_ips(
                 self.cluster_yaml,
                 self.launched_nodes,
                 handle=self,
                 head_ip_max_attempts=max_attempts,
                 worker_ip_max_attempts=max_attempts,
-                get_internal_ips=False)
+                get_internal_ips=False,
+                use_cached_head_ip=use_cached_head_ip)
 
             if self.external_ips() == cluster_external_ips:
                 # Optimization: If the cached external IPs are the same as the
@@ -2191,8 +2196,13 @@ class CloudVmRayBackend(backends.Backend):
                 tpu_create_script=config_dict.get('tpu-create-script'),
                 tpu_delete_script=config_dict.get('tpu-delete-script'))
 
-            ip_list = handle.external_ips(max_attempts=_FETCH_IP_MAX_ATTEMPTS,
-                                          use_cached_ips=False)
+            # The head IP of a multi-node cluster was just queried while
+            # waiting for the workers (wait_until_ray_cluster_ready), so
+            # reuse it instead of running `ray get-head-ip` again.
+            handle._update_stable_cluster_ips(  # pylint: disable=protected-access
+                max_attempts=_FETCH_IP_MAX_ATTEMPTS,
+                use_cached_head_ip=True)
+            ip_list = handle.external_ips()
 
             if 'tpu_name' in config_dict:
                 self._set_tpu_name(handle, config_dict['tpu_name'])
@@ -2900,6 +2910,8 @@ class CloudVmRayBackend(backends.Backend):
         log_path = os.path.join(os.path.expanduser(self.log_dir),
                                 'teardown.log')
         log_abs_path = os.path.abspath(log_path)
+        # Nodes get new IPs once they are stopped or terminated.
+        backend_utils.invalidate_head_ip_cache(handle.cluster_yaml)
         cloud = handle.launched_resources.cloud
         config = common_utils.read_yaml(handle.cluster_yaml)
         cluster_name = handle.cluster_name
@@ -2930,11 +2942,18 @@ class CloudVmRayBackend(backends.Backend):
                 query_cmd = (
                     f'aws ec2 describe-instances --region {region} --filters '
                     f'Name=tag:ray-cluster-name,Values={handle.cluster_name} '
+                    'Name=instance-state-name,'
+                    'Values=pending,running,stopping,stopped '
                     f'--query Reservations[].Instances[].InstanceId '
                     '--output text')
+                # Skip the (mutating) terminate call when no instance is left,
+                # e.g. when retrying a teardown or the instances were removed
+                # outside of SkyPilot.
                 terminate_cmd = (
+                    f'instance_ids=$({query_cmd}) && '
+                    '{ [ -z "$instance_ids" ] || '
                     f'aws ec2 terminate-instances --region {region} '
-                    f'--instance-ids $({query_cmd})')
+                    '--instance-ids $instance_ids; }')
             elif isinstance(cloud, clouds.GCP):
                 zone = config['provider']['availability_zone']
                 # TODO(wei-lin): refactor by calling functions of node provider
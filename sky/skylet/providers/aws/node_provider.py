@@ -1,9 +1,11 @@
 import copy
 import logging
+import random
 import threading
 import time
 from collections import defaultdict, OrderedDict
-from typing import Any, Dict, List
+from multiprocessing import pool
+from typing import Any, Dict, Iterator, List
 
 import botocore
 from boto3.resources.base import ServiceResource
@@ -39,6 +41,69 @@ from ray.autoscaler.tags import (
 logger = logging.getLogger(__name__)
 
 TAG_BATCH_DELAY = 1
+# Maximum number of resource ids accepted by a single CreateTags call.
+CREATE_TAGS_MAX_RESOURCES = 1000
+# Maximum number of instances returned per DescribeInstances page. AWS only
+# paginates when MaxResults is set; otherwise all matching instances are
+# returned in a single response, which can time out for large accounts.
+DESCRIBE_INSTANCES_PAGE_SIZE = 1000
+# Seconds for which a non_terminated_nodes() query result is reused. Matches
+# the autoscaler update interval, so repeated queries within one update share
+# a single DescribeInstances call.
+DESCRIBE_INSTANCES_CACHE_TTL = 5
+# Seconds to wait for concurrent point queries to join a batched
+# DescribeInstances call, and the maximum number of ids per call (the
+# maximum number of values in a single filter).
+DESCRIBE_BATCH_DELAY = 0.3
+DESCRIBE_BATCH_MAX_IDS = 200
+# Polling interval (seconds) and attempts when waiting for stopping instances
+# to be stopped before they are reused.
+STOPPED_WAITER_DELAY = 10
+STOPPED_WAITER_MAX_ATTEMPTS = 60
+# Maximum number of independent EC2 API calls issued concurrently.
+MAX_CONCURRENT_EC2_CALLS = 8
+# RunInstances errors meaning the requested capacity is unavailable in the
+# subnet's availability zone; the next subnet may still succeed. Any other
+# error (e.g. InvalidParameterValue for a bad AMI) fails in every subnet.
+CAPACITY_ERROR_CODES = {
+    "InsufficientInstanceCapacity",
+    "InsufficientHostCapacity",
+    "InsufficientFreeAddressesInSubnet",
+}
+# RunInstances errors meaning the request was rate limited.
+THROTTLING_ERROR_CODES = {"RequestLimitExceeded", "Throttling"}
+# Base and maximum delay (seconds) of the backoff between throttled
+# RunInstances attempts.
+CREATE_BACKOFF_BASE_DELAY = 1
+CREATE_BACKOFF_MAX_DELAY = 20
+
+
+def _map_concurrently(func, args):
+    """Applies `func` to each of `args`, running I/O-bound calls in parallel.
+
+    Concurrency is capped at MAX_CONCURRENT_EC2_CALLS to stay within the EC2
+    API rate limits.
+    """
+    if len(args) <= 1:
+        return [func(arg) for arg in args]
+    with pool.ThreadPool(processes=min(MAX_CONCURRENT_EC2_CALLS, len(args))) as p:
+        return p.map(func, args)
+
+
+def _is_capacity_error(exc) -> bool:
+    """Whether launching in another subnet may avoid this RunInstances error."""
+    error = exc.response.get("Error", {})
+    if error.get("Code") == "Unsupported":
+        # E.g. "Your requested instance type (p3.16xlarge) is not supported in
+        # your requested Availability Zone (us-east-1c)." Other Unsupported
+        # errors, such as an unsupported configuration, fail in every zone.
+        return "Availability Zone" in error.get("Message", "")
+    return error.get("Code") in CAPACITY_ERROR_CODES
+
+
+def _format_tags(tags):
+    """Converts a {key: value} dict to the AWS [{"Key", "Value"}] format."""
+    return [{"Key": k, "Value": v} for k, v in tags.items()]
 
 
 def to_aws_format(tags):
@@ -65,6 +130,21 @@ def make_ec2_resource(region, max_retries, aws_credentials=None):
     return resource_cache("ec2", region, max_retries, **aws_credentials)
 
 
+def iter_ec2_instances(
+    region: str, aws_credentials: Dict[str, Any] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yields the instance-types available in the user's AWS region.
+
+    Instance types are yielded page by page as they are fetched, so callers
+    that only keep a few of them never hold the full list in memory. See
+    list_ec2_instances() for the format of each element.
+    """
+    aws_credentials = aws_credentials or {}
+    ec2 = client_cache("ec2", region, BOTO_MAX_RETRIES, **aws_credentials)
+    for page in ec2.get_paginator("describe_instance_types").paginate():
+        yield from page["InstanceTypes"]
+
+
 def list_ec2_instances(
     region: str, aws_credentials: Dict[str, Any] = None
 ) -> List[Dict[str, Any]]:
@@ -82,18 +162,17 @@ def list_ec2_instances(
             ...}
 
     """
-    final_instance_types = []
-    aws_credentials = aws_credentials or {}
-    ec2 = client_cache("ec2", region, BOTO_MAX_RETRIES, **aws_credentials)
-    instance_types = ec2.describe_instance_types()
-    final_instance_types.extend(copy.deepcopy(instance_types["InstanceTypes"]))
-    while "NextToken" in instance_types:
-        instance_types = ec2.describe_instance_types(
-            NextToken=instance_types["NextToken"]
-        )
-        final_instance_types.extend(copy.deepcopy(instance_types["InstanceTypes"]))
+    return list(iter_ec2_instances(region, aws_credentials))
+
+
+class _DescribeBatch:
+    """Instance ids queued for a single batched DescribeInstances call."""
 
-    return final_instance_types
+    def __init__(self):
+        self.node_ids = set()
+        self.nodes = {}
+        self.error = None
+        self.done = threading.Event()
 
 
 class AWSNodeProvider(NodeProvider):
@@ -114,6 +193,10 @@ class AWSNodeProvider(NodeProvider):
             max_retries=BOTO_MAX_RETRIES,
             aws_credentials=aws_credentials,
         )
+        # Used to launch instances. botocore does not retry here: EC2 returns
+        # capacity errors as server errors, which any botocore retry mode
+        # would retry in the same subnet. _create_node retries throttling
+        # itself and moves to the next subnet on capacity errors.
         self.ec2_fail_fast = make_ec2_resource(
             region=provider_config["region"],
             max_retries=0,
@@ -136,15 +219,63 @@ class AWSNodeProvider(NodeProvider):
         # Cache of node objects from the last nodes() call. This avoids
         # excessive DescribeInstances requests.
         self.cached_nodes = {}
+        # Recent DescribeInstances results, keyed by query. See
+        # _describe_instances().
+        self.describe_cache = {}
+        # Bumped on every invalidation, so that a query that started before
+        # an invalidation does not store its (possibly stale) result.
+        self.describe_cache_generation = 0
+        self.describe_cache_lock = threading.Lock()
+        # Point queries waiting to be sent as one DescribeInstances call. See
+        # _describe_instance_ids().
+        self.describe_batch = None
+        self.describe_batch_lock = threading.Lock()
 
     def non_terminated_nodes(self, tag_filters):
         # Note that these filters are acceptable because they are set on
         #       node initialization, and so can never be sitting in the cache.
         tag_filters = to_aws_format(tag_filters)
+
+        with boto_exception_handler("Failed to fetch running instances from AWS."):
+            nodes = self._describe_instances(
+                ["pending", "running"], tag_filters, use_cache=True
+            )
+
+        # Populate the tag cache with initial information if necessary
+        for node in nodes:
+            if node.id in self.tag_cache:
+                continue
+
+            self.tag_cache[node.id] = from_aws_format(
+                {x["Key"]: x["Value"] for x in node.tags}
+            )
+
+        self.cached_nodes = {node.id: node for node in nodes}
+        return [node.id for node in nodes]
+
+    def _describe_instances(self, states, tag_filters=None, use_cache=False):
+        """Returns this cluster's instances in `states` matching `tag_filters`.
+
+        Filtering happens server-side and results are fetched page by page.
+        With `use_cache`, a result fetched within the last
+        DESCRIBE_INSTANCES_CACHE_TTL seconds for the same query is reused.
+        """
+        tag_filters = tag_filters or {}
+        key = (tuple(states), tuple(sorted(tag_filters.items())))
+        with self.describe_cache_lock:
+            generation = self.describe_cache_generation
+            cached = self.describe_cache.get(key)
+        if use_cache:
+            if (
+                cached is not None
+                and time.monotonic() - cached[0] < DESCRIBE_INSTANCES_CACHE_TTL
+            ):
+                return list(cached[1])
+
         filters = [
             {
                 "Name": "instance-state-name",
-                "Values": ["pending", "running"],
+                "Values": list(states),
             },
             {
                 "Name": "tag:{}".format(TAG_RAY_CLUSTER_NAME),
@@ -158,21 +289,66 @@ class AWSNodeProvider(NodeProvider):
                     "Values": [v],
                 }
             )
+        query_time = time.monotonic()
+        nodes = list(
+            self.ec2.instances.filter(Filters=filters).page_size(
+                DESCRIBE_INSTANCES_PAGE_SIZE
+            )
+        )
+        with self.describe_cache_lock:
+            if generation == self.describe_cache_generation:
+                self.describe_cache[key] = (query_time, nodes)
+        return list(nodes)
 
-        with boto_exception_handler("Failed to fetch running instances from AWS."):
-            nodes = list(self.ec2.instances.filter(Filters=filters))
+    def _describe_instance_ids(self, node_ids):
+        """Returns a dict mapping each found id in `node_ids` to its instance.
 
-        # Populate the tag cache with initial information if necessary
-        for node in nodes:
-            if node.id in self.tag_cache:
-                continue
+        Point queries from concurrent threads (e.g., node updaters waiting for
+        IPs) made within DESCRIBE_BATCH_DELAY seconds are coalesced into a
+        single DescribeInstances call.
+        """
+        is_batching_thread = False
+        with self.describe_batch_lock:
+            if self.describe_batch is None:
+                is_batching_thread = True
+                self.describe_batch = _DescribeBatch()
+            batch = self.describe_batch
+            batch.node_ids.update(node_ids)
 
-            self.tag_cache[node.id] = from_aws_format(
-                {x["Key"]: x["Value"] for x in node.tags}
-            )
+        if is_batching_thread:
+            time.sleep(DESCRIBE_BATCH_DELAY)
+            with self.describe_batch_lock:
+                self.describe_batch = None
+            batch_ids = sorted(batch.node_ids)
+            try:
+                for start in range(0, len(batch_ids), DESCRIBE_BATCH_MAX_IDS):
+                    ids = batch_ids[start : start + DESCRIBE_BATCH_MAX_IDS]
+                    # Filter on instance-id rather than passing InstanceIds,
+                    # so that an id that is unknown (e.g., not yet visible
+                    # after launch) is omitted instead of failing the whole
+                    # batch with InvalidInstanceID.NotFound.
+                    filters = [{"Name": "instance-id", "Values": ids}]
+                    for node in self.ec2.instances.filter(Filters=filters):
+                        batch.nodes[node.id] = node
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return {
+            node_id: batch.nodes[node_id]
+            for node_id in node_ids
+            if node_id in batch.nodes
+        }
 
-        self.cached_nodes = {node.id: node for node in nodes}
-        return [node.id for node in nodes]
+    def _invalidate_describe_cache(self):
+        with self.describe_cache_lock:
+            self.describe_cache.clear()
+            self.describe_cache_generation += 1
 
     def is_running(self, node_id):
         node = self._get_cached_node(node_id)
@@ -193,7 +369,7 @@ class AWSNodeProvider(NodeProvider):
         node = self._get_cached_node(node_id)
 
         if node.public_ip_address is None:
-            node = self._get_node(node_id)
+            node = self._refresh_node(node_id)
 
         return node.public_ip_address
 
@@ -201,7 +377,7 @@ class AWSNodeProvider(NodeProvider):
         node = self._get_cached_node(node_id)
 
         if node.private_ip_address is None:
-            node = self._get_node(node_id)
+            node = self._refresh_node(node_id)
 
         return node.private_ip_address
 
@@ -242,62 +418,54 @@ class AWSNodeProvider(NodeProvider):
         self.tag_cache_pending = defaultdict(dict)
 
         self._create_tags(batch_updates)
+        self._invalidate_describe_cache()
 
     def _create_tags(self, batch_updates):
-        for (k, v), node_ids in batch_updates.items():
+        def _create_tag(update):
+            (k, v), node_ids = update
             m = "Set tag {}={} on {}".format(k, v, node_ids)
             with LogTimer("AWSNodeProvider: {}".format(m)):
                 if k == TAG_RAY_NODE_NAME:
                     k = "Name"
-                self.ec2.meta.client.create_tags(
-                    Resources=node_ids,
-                    Tags=[{"Key": k, "Value": v}],
-                )
+                for start in range(0, len(node_ids), CREATE_TAGS_MAX_RESOURCES):
+                    self.ec2.meta.client.create_tags(
+                        Resources=node_ids[start : start + CREATE_TAGS_MAX_RESOURCES],
+                        Tags=[{"Key": k, "Value": v}],
+                    )
+
+        # Each tag is written with an independent call, e.g. node names
+        # differ per node, so issue them concurrently.
+        _map_concurrently(_create_tag, list(batch_updates.items()))
 
     def create_node(self, node_config, tags, count) -> Dict[str, Any]:
         """Creates instances.
 
-        Returns dict mapping instance id to ec2.Instance object for the created
-        instances.
+        Returns dict mapping instance id to the description of each created
+        instance, in the format returned by DescribeInstances.
         """
         # sort tags by key to support deterministic unit test stubbing
-        tags = OrderedDict(sorted(copy.deepcopy(tags).items()))
+        tags = OrderedDict(sorted(tags.items()))
 
         reused_nodes_dict = {}
         # Try to reuse previously stopped nodes with compatible configs
         if self.cache_stopped_nodes:
             # TODO(ekl) this is breaking the abstraction boundary a little by
             # peeking into the tag set.
-            filters = [
-                {
-                    "Name": "instance-state-name",
-                    "Values": ["stopped", "stopping"],
-                },
-                {
-                    "Name": "tag:{}".format(TAG_RAY_CLUSTER_NAME),
-                    "Values": [self.cluster_name],
-                },
-                {
-                    "Name": "tag:{}".format(TAG_RAY_NODE_KIND),
-                    "Values": [tags[TAG_RAY_NODE_KIND]],
-                },
-                {
-                    "Name": "tag:{}".format(TAG_RAY_LAUNCH_CONFIG),
-                    "Values": [tags[TAG_RAY_LAUNCH_CONFIG]],
-                },
-            ]
+            tag_filters = {
+                TAG_RAY_NODE_KIND: tags[TAG_RAY_NODE_KIND],
+                TAG_RAY_LAUNCH_CONFIG: tags[TAG_RAY_LAUNCH_CONFIG],
+            }
             # This tag may not always be present.
             if TAG_RAY_USER_NODE_TYPE in tags:
-                filters.append(
-                    {
-                        "Name": "tag:{}".format(TAG_RAY_USER_NODE_TYPE),
-                        "Values": [tags[TAG_RAY_USER_NODE_TYPE]],
-                    }
-                )
+                tag_filters[TAG_RAY_USER_NODE_TYPE] = tags[TAG_RAY_USER_NODE_TYPE]
 
-            reuse_nodes = list(self.ec2.instances.filter(Filters=filters))[:count]
+            reuse_nodes = self._describe_instances(
+                ["stopped", "stopping"], tag_filters
+            )[:count]
             reuse_node_ids = [n.id for n in reuse_nodes]
-            reused_nodes_dict = {n.id: n for n in reuse_nodes}
+            # Return the descriptions already fetched above, in the same
+            # format as newly created nodes.
+            reused_nodes_dict = {n.id: dict(n.meta.data) for n in reuse_nodes}
             if reuse_nodes:
                 cli_logger.print(
                     # todo: handle plural vs singular?
@@ -309,27 +477,87 @@ class AWSNodeProvider(NodeProvider):
 
                 # todo: timed?
                 with cli_logger.group("Stopping instances to reuse"):
+                    stopping_ids = []
                     for node in reuse_nodes:
                         self.tag_cache[node.id] = from_aws_format(
                             {x["Key"]: x["Value"] for x in node.tags}
                         )
                         if node.state["Name"] == "stopping":
                             cli_logger.print("Waiting for instance {} to stop", node.id)
-                            node.wait_until_stopped()
-
-                self.ec2.meta.client.start_instances(InstanceIds=reuse_node_ids)
-                for node_id in reuse_node_ids:
-                    self.set_node_tags(node_id, tags)
+                            stopping_ids.append(node.id)
+                    if stopping_ids:
+                        not_stopped_ids = self._wait_until_stopped(stopping_ids)
+                        if not_stopped_ids:
+                            cli_logger.print(
+                                "Not reusing nodes {} that did not stop.",
+                                cli_logger.render_list(not_stopped_ids),
+                            )
+                            reuse_node_ids = [
+                                node_id
+                                for node_id in reuse_node_ids
+                                if node_id not in not_stopped_ids
+                            ]
+                            for node_id in not_stopped_ids:
+                                del reused_nodes_dict[node_id]
+
+                # Only nodes confirmed to be stopped are started.
+                if reuse_node_ids:
+                    response = self.ec2.meta.client.start_instances(
+                        InstanceIds=reuse_node_ids
+                    )
+                    for instance in response["StartingInstances"]:
+                        reused_nodes_dict[instance["InstanceId"]]["State"] = instance[
+                            "CurrentState"
+                        ]
+                # Only write the tags that differ from those already on the
+                # reused nodes; in the common case nothing has changed and no
+                # CreateTags call is made.
+                batch_updates = defaultdict(list)
+                with self.tag_cache_lock:
+                    for node_id in reuse_node_ids:
+                        node_tags = self.tag_cache[node_id]
+                        for k, v in tags.items():
+                            if node_tags.get(k) != v:
+                                batch_updates[(k, v)].append(node_id)
+                        node_tags.update(tags)
+                self._create_tags(batch_updates)
                 count -= len(reuse_node_ids)
 
         created_nodes_dict = {}
         if count:
             created_nodes_dict = self._create_node(node_config, tags, count)
 
+        self._invalidate_describe_cache()
         all_created_nodes = reused_nodes_dict
         all_created_nodes.update(created_nodes_dict)
         return all_created_nodes
 
+    def _wait_until_stopped(self, node_ids):
+        """Waits for stopping nodes to stop. Returns the ids that did not.
+
+        A single waiter polls all nodes with one DescribeInstances call per
+        attempt. If it fails, e.g. because a node was started or terminated
+        concurrently, the nodes' current states are re-read, since EC2 state
+        is eventually consistent and the waiter may have seen a stale one.
+        """
+        try:
+            self.ec2.meta.client.get_waiter("instance_stopped").wait(
+                InstanceIds=node_ids,
+                WaiterConfig={
+                    "Delay": STOPPED_WAITER_DELAY,
+                    "MaxAttempts": STOPPED_WAITER_MAX_ATTEMPTS,
+                },
+            )
+            return []
+        except botocore.exceptions.WaiterError as e:
+            cli_logger.warning("Failed to wait for nodes to stop: {}", e)
+        nodes = self._describe_instance_ids(node_ids)
+        return [
+            node_id
+            for node_id in node_ids
+            if node_id not in nodes or nodes[node_id].state["Name"] != "stopped"
+        ]
+
     @staticmethod
     def _merge_tag_specs(
         tag_specs: List[Dict[str, Any]], user_tag_specs: List[Dict[str, Any]]
@@ -349,19 +577,20 @@ class AWSNodeProvider(NodeProvider):
             user_tag_specs (List[Dict[str, Any]]): user's node config tag specs
         """
 
+        # Index the base instance tags by key so that each user tag is merged
+        # in constant time. Dicts preserve insertion order, so overridden
+        # tags keep their position and new tags are appended.
+        instance_tags = {tag["Key"]: tag for tag in tag_specs[0]["Tags"]}
         for user_tag_spec in user_tag_specs:
             if user_tag_spec["ResourceType"] == "instance":
                 for user_tag in user_tag_spec["Tags"]:
-                    exists = False
-                    for tag in tag_specs[0]["Tags"]:
-                        if user_tag["Key"] == tag["Key"]:
-                            exists = True
-                            tag["Value"] = user_tag["Value"]
-                            break
-                    if not exists:
-                        tag_specs[0]["Tags"] += [user_tag]
+                    if user_tag["Key"] in instance_tags:
+                        instance_tags[user_tag["Key"]]["Value"] = user_tag["Value"]
+                    else:
+                        instance_tags[user_tag["Key"]] = user_tag
             else:
                 tag_specs += [user_tag_spec]
+        tag_specs[0]["Tags"] = list(instance_tags.values())
 
     def _create_node(self, node_config, tags, count):
         created_nodes_dict = {}
@@ -369,19 +598,7 @@ class AWSNodeProvider(NodeProvider):
         tags = to_aws_format(tags)
         conf = node_config.copy()
 
-        tag_pairs = [
-            {
-                "Key": TAG_RAY_CLUSTER_NAME,
-                "Value": self.cluster_name,
-            }
-        ]
-        for k, v in tags.items():
-            tag_pairs.append(
-                {
-                    "Key": k,
-                    "Value": v,
-                }
-            )
+        tag_pairs = _format_tags({TAG_RAY_CLUSTER_NAME: self.cluster_name, **tags})
         if CloudwatchHelper.cloudwatch_config_exists(self.provider_config, "agent"):
             cwa_installed = self._check_ami_cwa_installation(node_config)
             if cwa_installed:
@@ -409,27 +626,33 @@ class AWSNodeProvider(NodeProvider):
         # update config with min/max node counts and tag specs
         conf.update({"MinCount": 1, "MaxCount": count, "TagSpecifications": tag_specs})
 
-        # Try to always launch in the first listed subnet.
-        subnet_idx = 0
+        # Resolve everything except the subnet once. `conf` is not mutated
+        # by the attempts below; the subnet is set on a per-attempt copy.
         cli_logger_tags = {}
-        # NOTE: This ensures that we try ALL availability zones before
-        # throwing an error.
-        max_tries = max(BOTO_CREATE_MAX_RETRIES, len(subnet_ids))
-        for attempt in range(1, max_tries + 1):
+        use_network_interfaces = "NetworkInterfaces" in conf
+        if use_network_interfaces:
+            # remove security group IDs previously copied from network
+            # interfaces (create_instances call fails otherwise)
+            conf.pop("SecurityGroupIds", None)
+            cli_logger_tags["network_interfaces"] = str(conf["NetworkInterfaces"])
+
+        # Try to always launch in the first listed subnet. The subnets are
+        # ordered by the availability zones requested in the provider config,
+        # so each subnet is tried at most once, in that order, and dropped as
+        # soon as it reports a capacity error.
+        subnet_ids = list(subnet_ids)
+        throttle_retries = 0
+        while True:
+            attempt_conf = conf
+            if not use_network_interfaces:
+                subnet_id = subnet_ids[0]
+                attempt_conf = dict(conf, SubnetId=subnet_id)
+                cli_logger_tags["subnet_id"] = subnet_id
             try:
-                if "NetworkInterfaces" in conf:
-                    net_ifs = conf["NetworkInterfaces"]
-                    # remove security group IDs previously copied from network
-                    # interfaces (create_instances call fails otherwise)
-                    conf.pop("SecurityGroupIds", None)
-                    cli_logger_tags["network_interfaces"] = str(net_ifs)
-                else:
-                    subnet_id = subnet_ids[subnet_idx % len(subnet_ids)]
-                    conf["SubnetId"] = subnet_id
-                    cli_logger_tags["subnet_id"] = subnet_id
-
-                created = self.ec2_fail_fast.create_instances(**conf)
-                created_nodes_dict = {n.id: n for n in created}
+                created = self.ec2_fail_fast.meta.client.run_instances(
+                    **attempt_conf
+                )["Instances"]
+                created_nodes_dict = {n["InstanceId"]: n for n in created}
 
                 # todo: timed?
                 # todo: handle plurality?
@@ -445,31 +668,56 @@ class AWSNodeProvider(NodeProvider):
 
                         # The correct value is technically
                         # {"code": "0", "Message": "pending"}
-                        state_reason = instance.state_reason or {"Message": "pending"}
+                        state_reason = instance.get("StateReason") or {
+                            "Message": "pending"
+                        }
 
                         cli_logger.print(
                             "Launched instance {}",
-                            instance.instance_id,
+                            instance["InstanceId"],
                             _tags=dict(
-                                state=instance.state["Name"],
+                                state=instance["State"]["Name"],
                                 info=state_reason["Message"],
                             ),
                         )
                 break
             except botocore.exceptions.ClientError as exc:
-                if attempt == max_tries:
-                    cli_logger.abort(
-                        "Failed to launch instances. Max attempts exceeded.",
-                        exc=exc,
+                if (
+                    _is_capacity_error(exc)
+                    and not use_network_interfaces
+                    and len(subnet_ids) > 1
+                ):
+                    # Launch failure due to instance type availability in
+                    # the given AZ: move on to the next subnet.
+                    subnet_ids.pop(0)
+                    cli_logger.warning(
+                        "create_instances: Attempt failed with {}, retrying "
+                        "in the next subnet.",
+                        exc,
                     )
-                else:
+                elif (
+                    exc.response.get("Error", {}).get("Code")
+                    in THROTTLING_ERROR_CODES
+                    and throttle_retries < BOTO_CREATE_MAX_RETRIES
+                ):
+                    # Exponential backoff with full jitter.
+                    delay = random.uniform(
+                        0,
+                        min(
+                            CREATE_BACKOFF_MAX_DELAY,
+                            CREATE_BACKOFF_BASE_DELAY * 2**throttle_retries,
+                        ),
+                    )
+                    throttle_retries += 1
                     cli_logger.warning(
-                        "create_instances: Attempt failed with {}, retrying.", exc
+                        "create_instances: Attempt failed with {}, retrying "
+                        "in {:.1f}s.",
+                        exc,
+                        delay,
                     )
-
-                # Launch failure may be due to instance type availability in
-                # the given AZ
-                subnet_idx += 1
+                    time.sleep(delay)
+                else:
+                    cli_logger.abort("Failed to launch instances.", exc=exc)
 
         return created_nodes_dict
 
@@ -496,6 +744,7 @@ class AWSNodeProvider(NodeProvider):
                 node.stop()
         else:
             node.terminate()
+        self._invalidate_describe_cache()
 
         # TODO (Alex): We are leaking the tag cache here. Naively, we would
         # want to just remove the cache entry here, but terminating can be
@@ -572,12 +821,25 @@ class AWSNodeProvider(NodeProvider):
             else len(node_ids)
         )
 
-        for terminate_func, nodes in nodes_to_terminate.items():
-            for start in range(0, len(nodes), max_terminate_nodes):
-                terminate_func(InstanceIds=nodes[start : start + max_terminate_nodes])
+        def _terminate(call):
+            terminate_func, nodes = call
+            terminate_func(InstanceIds=nodes)
+
+        # Stopping and terminating (and each batch of ids) are independent
+        # calls, so issue them concurrently.
+        _map_concurrently(
+            _terminate,
+            [
+                (terminate_func, nodes[start : start + max_terminate_nodes])
+                for terminate_func, nodes in nodes_to_terminate.items()
+                for start in range(0, len(nodes), max_terminate_nodes)
+            ],
+        )
+        self._invalidate_describe_cache()
 
     def _get_node(self, node_id):
         """Refresh and get info for this node, updating the cache."""
+        self._invalidate_describe_cache()
         self.non_terminated_nodes({})  # Side effect: updates cache
 
         if node_id in self.cached_nodes:
@@ -585,9 +847,35 @@ class AWSNodeProvider(NodeProvider):
 
         # Node not in {pending, running} -- retry with a point query. This
         # usually means the node was recently preempted or terminated.
-        matches = list(self.ec2.instances.filter(InstanceIds=[node_id]))
-        assert len(matches) == 1, "Invalid instance id {}".format(node_id)
-        return matches[0]
+        return self._refresh_node(node_id)
+
+    def _refresh_node(self, node_id):
+        """Re-reads a single node with a point query, updating the cache.
+
+        Unlike _get_node(), this does not re-list the whole cluster, so e.g.
+        waiting for a node's IP costs one (batched) DescribeInstances call.
+        """
+        matches = self._describe_instance_ids([node_id])
+        assert node_id in matches, "Invalid instance id {}".format(node_id)
+        node = matches[node_id]
+        self.cached_nodes[node_id] = node
+        # Also update cached non_terminated_nodes() results, which would
+        # otherwise rebuild cached_nodes with the stale node within the TTL.
+        # A node that has left the states of a cached query (e.g., it is now
+        # shutting down) is dropped from that query's result.
+        with self.describe_cache_lock:
+            for key, (query_time, nodes) in self.describe_cache.items():
+                states = key[0]
+                keep = node.state["Name"] in states
+                self.describe_cache[key] = (
+                    query_time,
+                    [
+                        node if n.id == node_id else n
+                        for n in nodes
+                        if n.id != node_id or keep
+                    ],
+                )
+        return node
 
     def _get_cached_node(self, node_id):
         """Return node info from cache if possible, otherwise fetches it."""
@@ -609,14 +897,21 @@ class AWSNodeProvider(NodeProvider):
             return cluster_config
         cluster_config = copy.deepcopy(cluster_config)
 
-        instances_list = list_ec2_instances(
-            cluster_config["provider"]["region"],
-            cluster_config["provider"].get("aws_credentials"),
-        )
+        available_node_types = cluster_config["available_node_types"]
+        # Only keep the few instance types in use out of the hundreds
+        # available in the region.
+        used_instance_types = {
+            node_type["node_config"]["InstanceType"]
+            for node_type in available_node_types.values()
+        }
         instances_dict = {
-            instance["InstanceType"]: instance for instance in instances_list
+            instance["InstanceType"]: instance
+            for instance in iter_ec2_instances(
+                cluster_config["provider"]["region"],
+                cluster_config["provider"].get("aws_credentials"),
+            )
+            if instance["InstanceType"] in used_instance_types
         }
-        available_node_types = cluster_config["available_node_types"]
         head_node_type = cluster_config["head_node_type"]
         for node_type in available_node_types:
             instance_type = available_node_types[node_type]["node_config"][
@@ -142,10 +142,18 @@ def boto_exception_handler(msg, *args, **kwargs):
     return ExceptionHandlerContextManager()
 
 
-@lru_cache()
 def resource_cache(
     name, region, max_retries=BOTO_MAX_RETRIES, **kwargs
 ) -> ServiceResource:
+    # Normalize the arguments before hitting the cache, so that calls passing
+    # the same settings positionally, by keyword or through the defaults all
+    # share a single resource instead of each loading the service model.
+    return _resource_cache(name, region, max_retries, tuple(sorted(kwargs.items())))
+
+
+@lru_cache()
+def _resource_cache(name, region, max_retries, kwargs_items):
+    kwargs = dict(kwargs_items)
     cli_logger.verbose(
         "Creating AWS resource `{}` in `{}`", cf.bold(name), cf.bold(region)
     )
@@ -160,8 +168,13 @@ def resource_cache(
     )
 
 
-@lru_cache()
 def client_cache(name, region, max_retries=BOTO_MAX_RETRIES, **kwargs) -> BaseClient:
+    return _client_cache(name, region, max_retries, tuple(sorted(kwargs.items())))
+
+
+@lru_cache()
+def _client_cache(name, region, max_retries, kwargs_items):
+    kwargs = dict(kwargs_items)
     try:
         # try to re-use a client from the resource cache first
         return resource_cache(name, region, max_retries, **kwargs).meta.client
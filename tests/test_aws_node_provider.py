@@ -0,0 +1,180 @@
+import threading
+import types
+
+import pytest
+
+from sky.skylet.providers.aws import node_provider
+
+
+class _FakeCollection:
+
+    def __init__(self, fetch):
+        self._fetch = fetch
+
+    def page_size(self, count):
+        del count  # Unused.
+        return self
+
+    def __iter__(self):
+        return iter(self._fetch())
+
+
+class _FakeInstances:
+    """Stands in for ec2.instances; `handler(**filter_kwargs)` lists nodes."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def filter(self, **kwargs):
+        self.calls.append(kwargs)
+        return _FakeCollection(lambda: self.handler(**kwargs))
+
+
+def _node(node_id, state='running'):
+    return types.SimpleNamespace(id=node_id, state={'Name': state}, tags=[])
+
+
+def _ids_of(filter_kwargs):
+    [instance_id_filter] = filter_kwargs['Filters']
+    assert instance_id_filter['Name'] == 'instance-id'
+    return instance_id_filter['Values']
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setattr(node_provider, 'make_ec2_resource',
+                        lambda *args, **kwargs: None)
+    monkeypatch.setattr(node_provider, 'DESCRIBE_BATCH_DELAY', 0.2)
+    return node_provider.AWSNodeProvider({'region': 'us-east-1'},
+                                         'test-cluster')
+
+
+def _set_instances(provider, handler):
+    instances = _FakeInstances(handler)
+    provider.ec2 = types.SimpleNamespace(instances=instances)
+    return instances
+
+
+def _run_in_threads(func, args_list):
+    results = [None] * len(args_list)
+    errors = [None] * len(args_list)
+
+    def _run(i):
+        try:
+            results[i] = func(*args_list[i])
+        except Exception as e:  # pylint: disable=broad-except
+            errors[i] = e
+
+    threads = [
+        threading.Thread(target=_run, args=(i,)) for i in range(len(args_list))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_describe_instance_ids_shares_one_call(provider):
+    instances = _set_instances(
+        provider, lambda **kwargs: [_node(i) for i in _ids_of(kwargs)])
+    node_ids = [f'i-{i}' for i in range(5)]
+    results, errors = _run_in_threads(provider._describe_instance_ids,
+                                      [([node_id],) for node_id in node_ids])
+    assert errors == [None] * len(node_ids)
+    assert len(instances.calls) == 1
+    assert sorted(_ids_of(instances.calls[0])) == node_ids
+    for node_id, result in zip(node_ids, results):
+        # Each caller only gets the ids it asked for.
+        assert list(result) == [node_id]
+        assert result[node_id].id == node_id
+
+
+def test_describe_instance_ids_omits_unknown_ids(provider):
+    _set_instances(provider, lambda **kwargs: [_node('i-known')])
+    assert provider._describe_instance_ids(['i-known', 'i-unknown']).keys() == {
+        'i-known'
+    }
+
+
+def test_describe_instance_ids_chunks_large_batches(provider):
+    instances = _set_instances(
+        provider, lambda **kwargs: [_node(i) for i in _ids_of(kwargs)])
+    node_ids = [f'i-{i:04d}' for i in range(450)]
+    assert len(provider._describe_instance_ids(node_ids)) == 450
+    assert [len(_ids_of(call)) for call in instances.calls] == [200, 200, 50]
+
+
+def test_describe_instance_ids_new_batch_after_detach(provider):
+    first_call_started = threading.Event()
+    release_first_call = threading.Event()
+
+    def _handler(**kwargs):
+        if not first_call_started.is_set():
+            first_call_started.set()
+            # The first batch is detached before its call is made, so ids
+            # queued from now on must start a new batch.
+            assert release_first_call.wait(timeout=10)
+        return [_node(i) for i in _ids_of(kwargs)]
+
+    instances = _set_instances(provider, _handler)
+    first = threading.Thread(target=provider._describe_instance_ids,
+                             args=(['i-first'],))
+    first.start()
+    assert first_call_started.wait(timeout=10)
+    assert provider._describe_instance_ids(['i-second']).keys() == {'i-second'}
+    release_first_call.set()
+    first.join()
+    assert [_ids_of(call) for call in instances.calls] == [['i-first'],
+                                                         ['i-second']]
+
+
+def test_describe_instance_ids_error_reaches_every_waiter(provider):
+    error = RuntimeError('DescribeInstances failed')
+
+    def _handler(**kwargs):
+        del kwargs  # Unused.
+        raise error
+
+    instances = _set_instances(provider, _handler)
+    results, errors = _run_in_threads(provider._describe_instance_ids,
+                                      [([f'i-{i}'],) for i in range(3)])
+    assert len(instances.calls) == 1
+    assert results == [None] * 3
+    assert errors == [error] * 3
+
+
+def test_describe_instances_cached(provider):
+    instances = _set_instances(provider, lambda **kwargs: [_node('i-1')])
+    for _ in range(2):
+        nodes = provider._describe_instances(['pending', 'running'],
+                                             use_cache=True)
+        assert [n.id for n in nodes] == ['i-1']
+    assert len(instances.calls) == 1
+
+
+def test_describe_instances_not_cached_across_invalidation(provider):
+
+    def _handler(**kwargs):
+        del kwargs  # Unused.
+        # E.g., create_node finishes while this query is in flight.
+        provider._invalidate_describe_cache()
+        return [_node('i-1')]
+
+    instances = _set_instances(provider, _handler)
+    provider._describe_instances(['pending', 'running'], use_cache=True)
+    assert provider.describe_cache == {}
+    provider._describe_instances(['pending', 'running'], use_cache=True)
+    assert len(instances.calls) == 2
+
+
+def test_refresh_node_drops_nodes_leaving_cached_states(provider):
+    running = _node('i-1')
+    instances = _set_instances(provider, lambda **kwargs: [running])
+    provider.non_terminated_nodes({})
+
+    instances.handler = lambda **kwargs: [_node('i-1', state='shutting-down')]
+    provider._refresh_node('i-1')
+    assert provider.non_terminated_nodes({}) == []
+    assert len(instances.calls) == 2
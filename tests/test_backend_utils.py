@@ -0,0 +1,99 @@
+import subprocess
+import types
+
+import pytest
+
+from sky.backends import backend_utils
+
+
+@pytest.fixture
+def fake_head_ip_query(monkeypatch):
+    """Fakes `ray get-head-ip` and the clock; returns the list of queries."""
+    now = [1000.0]
+    queries = []
+
+    def _fake_run(cmd, **kwargs):
+        del kwargs  # Unused.
+        queries.append(cmd)
+        return types.SimpleNamespace(
+            stdout=f'10.0.0.{len(queries)}\n'.encode())
+
+    monkeypatch.setattr(backend_utils, '_head_ip_cache', {})
+    monkeypatch.setattr(backend_utils.subprocess_utils, 'run', _fake_run)
+    monkeypatch.setattr(
+        backend_utils, 'time',
+        types.SimpleNamespace(monotonic=lambda: now[0], sleep=lambda _: None))
+    return now, queries
+
+
+def test_head_ip_cached_within_ttl(fake_head_ip_query):
+    now, queries = fake_head_ip_query
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.1'
+    now[0] += backend_utils._HEAD_IP_CACHE_TTL_SECONDS - 1
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.1'
+    assert len(queries) == 1
+
+
+def test_head_ip_requeried_after_ttl(fake_head_ip_query):
+    now, queries = fake_head_ip_query
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.1'
+    now[0] += backend_utils._HEAD_IP_CACHE_TTL_SECONDS
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.2'
+    assert len(queries) == 2
+
+
+def test_head_ip_ttl_counts_from_query_start(fake_head_ip_query, monkeypatch):
+    now, queries = fake_head_ip_query
+    fake_run = backend_utils.subprocess_utils.run
+
+    def _slow_run(cmd, **kwargs):
+        now[0] += 10
+        return fake_run(cmd, **kwargs)
+
+    monkeypatch.setattr(backend_utils.subprocess_utils, 'run', _slow_run)
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.1'
+    # The query started 10s ago, so the entry expires 10s early.
+    now[0] += backend_utils._HEAD_IP_CACHE_TTL_SECONDS - 10
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.2'
+    assert len(queries) == 2
+
+
+def test_head_ip_not_cached_by_default(fake_head_ip_query):
+    _, queries = fake_head_ip_query
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.1'
+    # Callers outside the provisioning path always query the cloud ...
+    assert backend_utils._query_head_ip_with_retries('c.yml') == '10.0.0.2'
+    assert backend_utils._query_head_ip_with_retries('tmp.yml') == '10.0.0.3'
+    # ... and do not update the cache.
+    assert list(backend_utils._head_ip_cache.values()) == [(1000.0,
+                                                            '10.0.0.1')]
+    assert len(queries) == 3
+
+
+def test_invalidate_head_ip_cache(fake_head_ip_query):
+    _, queries = fake_head_ip_query
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.1'
+    backend_utils.invalidate_head_ip_cache('c.yml')
+    assert backend_utils._query_head_ip_with_retries(
+        'c.yml', use_cache=True) == '10.0.0.2'
+    assert len(queries) == 2
+
+
+def test_head_ip_query_failure_not_cached(fake_head_ip_query, monkeypatch):
+
+    def _failing_run(cmd, **kwargs):
+        del kwargs  # Unused.
+        raise subprocess.CalledProcessError(1, cmd)
+
+    monkeypatch.setattr(backend_utils.subprocess_utils, 'run', _failing_run)
+    with pytest.raises(RuntimeError):
+        backend_utils._query_head_ip_with_retries('c.yml', use_cache=True)
+    assert backend_utils._head_ip_cache == {}